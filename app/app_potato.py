@@ -2,6 +2,8 @@
 import streamlit as st                # Streamlit for interactive web app interface
 import matplotlib.pyplot as plt       # Matplotlib for plotting graphs
 import sys, os                        # Used for adjusting the Python path so imports work
+import io                             # In-memory buffer for the rendered plot image
+import numpy as np                    # NumPy for the reusable simulation buffers
 
 # --- Add project root directory to Python path ---
 # This allows importing files from the parent directory (the 'src' folder)
@@ -12,7 +14,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 # GrowthParamsPotato: default biological parameters for potato growth
 # ChamberParams: environmental model parameters (heat, cooling, etc.)
 # simulate_potato: main function that runs the crop + chamber simulation
-from src.potato_twin import ScenarioPotato, GrowthParamsPotato, ChamberParams, simulate_potato
+from src.potato_twin import ScenarioPotato, GrowthParamsPotato, ChamberParams, simulate_potato, OUT_BUFFER_KEYS
 
 # --- App Title ---
 st.title("Mini Digital Twin: Potato (phenology + tuber partition)")
@@ -45,32 +47,51 @@ cool_kJ_day = st.sidebar.slider("Cooling Capacity (kJ/day)", 0, 60000, 25000, 10
 ambient_T = st.sidebar.slider("Ambient Temp (°C)", 10.0, 35.0, 20.0, 0.5)            # Outside environment temp
 
 # ===============================
-# 3. CREATE MODEL INSTANCES
+# 3. CREATE MODEL INSTANCES + RUN (CACHED)
 # ===============================
-# Define the input scenarios for plant and chamber based on user sliders
-scn = ScenarioPotato(
-    days=days,
-    ppfd_umol_m2_s=ppfd,
-    photoperiod_h=photoperiod,
-    co2_ppm=co2,
-    target_chamber_temp_C=target_T,
-    initial_leaf_dry_g=init_leaf,
-    ground_area_m2=area
-)
-
-# Chamber parameters (energy balance, cooling, etc.)
-cp = ChamberParams(
-    led_power_W=led_W,
-    other_power_W=other_W,
-    cooling_capacity_kJ_per_day=cool_kJ_day,
-    ambient_temp_C=ambient_T
-)
+# Streamlit reruns this whole script on every widget interaction.
+# Caching on the raw slider values means an unchanged set of inputs
+# returns the stored result instead of re-running the simulation.
+# The leading underscore keeps `_out_buffers` out of the cache key.
+# On a cache miss Streamlit returns the computed dict itself, so `res`
+# aliases this session's buffers until the next simulation overwrites
+# them. That is safe only because a session runs one script at a time:
+# use `res` within the current rerun and never hold on to it across reruns.
+@st.cache_data(max_entries=32)
+def _run(days, ppfd, photoperiod, co2, target_T, init_leaf, area, led_W, other_W, cool_kJ_day, ambient_T,
+         _out_buffers=None):
+    # Define the input scenarios for plant and chamber based on user sliders
+    scn = ScenarioPotato(
+        days=days,
+        ppfd_umol_m2_s=ppfd,
+        photoperiod_h=photoperiod,
+        co2_ppm=co2,
+        target_chamber_temp_C=target_T,
+        initial_leaf_dry_g=init_leaf,
+        ground_area_m2=area
+    )
+
+    # Chamber parameters (energy balance, cooling, etc.)
+    cp = ChamberParams(
+        led_power_W=led_W,
+        other_power_W=other_W,
+        cooling_capacity_kJ_per_day=cool_kJ_day,
+        ambient_temp_C=ambient_T
+    )
+
+    return simulate_potato(scn, GrowthParamsPotato(), cp, out_buffers=_out_buffers)
 
 # ===============================
 # 4️⃣ RUN SIMULATION
 # ===============================
+# Per-session state buffers, keyed by simulation length, reused across reruns
+bufs = st.session_state.setdefault("bufs", {})
+if days not in bufs:
+    bufs[days] = {key: np.zeros(days + 1) for key in OUT_BUFFER_KEYS}
+
 # Call your model with the chosen parameters
-res = simulate_potato(scn, GrowthParamsPotato(), cp)
+res = _run(days, ppfd, photoperiod, co2, target_T, init_leaf, area, led_W, other_W, cool_kJ_day, ambient_T,
+           _out_buffers=bufs[days])
 
 # The result dictionary ('res') contains arrays of daily values:
 #   res["days"] → list of days
@@ -100,26 +121,51 @@ st.caption(f"DLI = {res['dli_mol_m2_d']:.2f} mol m⁻² d⁻¹")
 # 6️⃣ PLOTS / VISUAL OUTPUTS
 # ===============================
 
-# --- Plot 1: Tuber Fresh Mass over time ---
-fig1, ax1 = plt.subplots()
-ax1.plot(res["days"], res["tuber_fresh_g"])
-ax1.set_xlabel("Day")
-ax1.set_ylabel("Tuber Fresh Mass (g)")
-ax1.set_title("Potato Tuber Fresh Mass")
-st.pyplot(fig1)
-
-# --- Plot 2: Accumulated Thermal Time (°C·day) ---
-fig2, ax2 = plt.subplots()
-ax2.plot(res["days"], res["thermal_time"])
-ax2.set_xlabel("Day")
-ax2.set_ylabel("Thermal Time (°C·day)")
-ax2.set_title("Accumulated Thermal Time")
-st.pyplot(fig2)
-
-# --- Plot 3: Chamber Temperature ---
-fig3, ax3 = plt.subplots()
-ax3.plot(res["days"], res["chamber_temp_C"])
-ax3.set_xlabel("Day")
-ax3.set_ylabel("Chamber Temp (°C)")
-ax3.set_title("Chamber Temperature")
-st.pyplot(fig3)
+# Screen-resolution output keeps the PNG streamed on each rerun small
+PLOT_DPI = 72
+
+def _figure_png(fig):
+    """Encode a Figure as PNG bytes and close it.
+
+    Plots are cached as bytes (st.cache_data), never as Figure objects:
+    pyplot keeps every open Figure alive until it is closed, and a shared
+    cached Figure would be redrawn from several sessions' threads at once.
+    """
+    # Save at PLOT_DPI ourselves (st.pyplot would re-render at dpi=200)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=PLOT_DPI, bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
+
+# The rendered PNG is cached on its data, so a rerun that doesn't change
+# the simulation output reuses the encoded image instead of redrawing it.
+# All three panels share one Figure so each rerun encodes a single image.
+@st.cache_data(max_entries=32)
+def _results_png(x, tuber_fresh, thermal_time, chamber_temp):
+    # Sized to fit the centered page column (~700 px at PLOT_DPI) without
+    # downscaling, with a larger font so the three panels stay readable
+    with plt.rc_context({"font.size": 12}):
+        fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(10, 3.2))
+
+        # --- Plot 1: Tuber Fresh Mass over time ---
+        ax1.plot(x, tuber_fresh)
+        ax1.set_xlabel("Day")
+        ax1.set_ylabel("Tuber Fresh Mass (g)")
+        ax1.set_title("Potato Tuber Fresh Mass")
+
+        # --- Plot 2: Accumulated Thermal Time (°C·day) ---
+        ax2.plot(x, thermal_time)
+        ax2.set_xlabel("Day")
+        ax2.set_ylabel("Thermal Time (°C·day)")
+        ax2.set_title("Accumulated Thermal Time")
+
+        # --- Plot 3: Chamber Temperature ---
+        ax3.plot(x, chamber_temp)
+        ax3.set_xlabel("Day")
+        ax3.set_ylabel("Chamber Temp (°C)")
+        ax3.set_title("Chamber Temperature")
+
+        fig.tight_layout()
+        return _figure_png(fig)
+
+st.image(_results_png(res["days"], res["tuber_fresh_g"], res["thermal_time"], res["chamber_temp_C"]))
@@ -0,0 +1,33 @@
+# ======================================
+# AHEAD-OF-TIME BUILD FOR THE DAILY KERNEL
+# --------------------------------------
+# Compiles the Numba simulation kernel into a regular extension
+# module (src/potato_ext.*.so) so the app doesn't pay the JIT
+# compile cost on first launch. The module also exports a hash of
+# potato_twin.py; potato_twin ignores an extension whose hash no
+# longer matches its source, so rebuild after editing the model.
+#
+# Usage:  python src/build_potato_ext.py
+# ======================================
+
+import sys, os
+
+# Add project root so 'src' imports the same way the app does
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from numba.pycc import CC
+from src.potato_twin import _simulate_kernel, _KERNEL_SIGNATURE, _SOURCE_HASH
+
+cc = CC("potato_ext")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export("simulate_kernel", _KERNEL_SIGNATURE)(_simulate_kernel.py_func)
+
+
+@cc.export("source_hash", "i8()")
+def source_hash():
+    """Hash of the potato_twin.py this module was built from."""
+    return _SOURCE_HASH
+
+
+if __name__ == "__main__":
+    cc.compile()
